@@ -4,13 +4,17 @@ import csv
 import os
 import time
 import threading
+import queue
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Optional, Iterable, Tuple, List, Pattern
+from typing import Callable, Optional, Iterable, Tuple, List, Pattern, Set
+from urllib.parse import urlsplit
 import re
 
-from playwright.sync_api import sync_playwright, Locator, Page
+from playwright.sync_api import sync_playwright, Browser, Locator, Page
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 # ---------------------------------------------------------------------
 # Paths & config
@@ -22,13 +26,17 @@ SCRIPT_DIR = Path(__file__).resolve().parent
 class Config:
     csv_file: Path = SCRIPT_DIR / "subscriptions.csv"
     log_file: Path = SCRIPT_DIR / "subscription_log.txt"
+    done_file: Path = SCRIPT_DIR / "subscription_log.done"
     skipped_file: Path = SCRIPT_DIR / "skipped_channels.csv"
     offset_file: Path = SCRIPT_DIR / "last_offset.txt"
     auth_file: Path = SCRIPT_DIR / "auth.json"
 
     wait_secs: float = 10.0
+    nav_timeout_ms: int = 8000  # default navigation timeout of worker / auth-check contexts
     throttle_secs: float = 1.5
     restart_every_n: int = 25
+    offset_flush_every: int = 10
+    workers: int = 4
     retries_per_channel: int = 0
     login_wait_secs: int = int(os.environ.get("YT_LOGIN_WAIT_SECS", "600"))
     headless_work: bool = True
@@ -42,39 +50,148 @@ class Config:
 
 CFG = Config()
 
-INIT_SCRIPT = """
-(() => {
-  const stopAll = () => {
-    document.querySelectorAll('video').forEach(v => {
-      try { v.muted = true; v.pause(); v.currentTime = 0; } catch {}
-    });
-  };
-  stopAll();
-  new MutationObserver(stopAll).observe(document.documentElement, {subtree:true, childList:true});
-})();
-"""
+# Hot-path values derived from CFG; refreshed by apply_config() whenever CFG is replaced
+WAIT_MS = int(CFG.wait_secs * 1000)
+ROLE_MS = CFG.role_first_try_ms
+THROTTLE = CFG.throttle_secs
+CHROMIUM_ARGS = list(CFG.chromium_args)
+
+def apply_config(cfg: Config) -> None:
+    global CFG, WAIT_MS, ROLE_MS, THROTTLE, CHROMIUM_ARGS
+    CFG = cfg
+    WAIT_MS = int(cfg.wait_secs * 1000)
+    ROLE_MS = cfg.role_first_try_ms
+    THROTTLE = cfg.throttle_secs
+    CHROMIUM_ARGS = list(cfg.chromium_args)
+
+# Keeps videos from starting on the login pages (worker / auth-check pages block media
+# instead): a one-time prototype override before any page script runs, no DOM observer
+INIT_SCRIPT = "HTMLMediaElement.prototype.play = function () { return Promise.resolve(); };"
 
 YOUTUBE_HOME = "https://www.youtube.com/"
+LOGIN_ENTER_POLL_MS = 1000
+HOME_DCL_TIMEOUT_MS = 5000
+
+# Requests the worker never needs: blocking them saves bytes per channel. CDP URL patterns
+# ('*' wildcard) standing in for the media/image/font/stylesheet types plus ad/analytics hosts
+BLOCKED_URL_PATTERNS = (
+    "*googlevideo.com/*",
+    "*i.ytimg.com/*",
+    "*yt3.ggpht.com/*",
+    "*yt3.googleusercontent.com/*",
+    "*fonts.gstatic.com/*",
+    "*.woff2*",
+    "*.css",
+    "*.css?*",
+    "*doubleclick*",
+    "*googleads*",
+    "*youtubei/v1/log_event*",
+)
+
+# In-page (SPA) navigation: push the same-origin path, let YouTube's router handle it, resolve on
+# yt-navigate-finish. If the router has not finished by then, the page falls back to goto for good
+SPA_NAV_TIMEOUT_MS = 3000
+SPA_NAVIGATE_SCRIPT = """
+([path, timeoutMs]) => new Promise(resolve => {
+  const done = ok => { window.removeEventListener('yt-navigate-finish', onFinish); resolve(ok); };
+  const onFinish = () => done(true);
+  window.addEventListener('yt-navigate-finish', onFinish);
+  history.pushState({}, '', path);
+  window.dispatchEvent(new Event('yt-navigate-start'));
+  window.dispatchEvent(new PopStateEvent('popstate', {state: {}}));
+  setTimeout(() => done(false), timeoutMs);
+})
+"""
 
 # Subscribe / Subscribed
-SUBSCRIBE_SELECTORS = (
-    "button:has-text('Subscribe')",
-    "yt-button-shape button:has(span:has-text('Subscribe'))",
-    "button[aria-label*='Subscribe']",
-    "//button[normalize-space()='Subscribe']",
-)
+# Subscribe is found by accessible role+name or aria-label (see subscribe_locator): no XPath and
+# no :has-text descendant scans
+SUBSCRIBE_ROLE_NAME = "Subscribe"
+SUBSCRIBE_ARIA_CSS = "button[aria-label*='Subscribe']"
 SUBSCRIBED_SELECTORS = (
     "yt-button-shape button:has(span:has-text('Subscribed'))",
     "button:has-text('Subscribed')",
     "button[aria-label*='Subscribed']",
 )
 
+# One union selector per role: a single wait resolves on whichever alternative matches first
+SUBSCRIBED_ANY = ", ".join(SUBSCRIBED_SELECTORS)
+
+# Consent interstitial (only ever shown on the first load of a session), in priority order: the
+# generic submit is last because the first consent form's submit is "Reject all"
+CONSENT_SELECTORS = (
+    "button:has-text('I agree')",
+    "button:has-text('Accept all')",
+    "#introAgreeButton",
+    "form[action*='consent'] button[type='submit']",
+)
+CONSENT_ANY = ", ".join(CONSENT_SELECTORS)
+
+# Per-context init script: clicks the consent dialog (CONSENT_SELECTORS in plain DOM terms) as
+# soon as it renders. The observer disconnects after a click or CONSENT_WATCH_MS so it costs
+# nothing on the mutation-heavy channel pages once the page has settled.
+CONSENT_WATCH_MS = 15000
+CONSENT_AUTOCLICK_SCRIPT = """
+(() => {
+  const find = () => [...document.querySelectorAll("form[action*='consent'] button, ytd-consent-bump-v2-lightbox button")]
+      .find(b => /I agree|Accept all/i.test(b.textContent || ''))
+    || document.querySelector('#introAgreeButton')
+    || document.querySelector("form[action*='consent'] button[type='submit']");
+  const tryClick = () => { const el = find(); if (el) { el.click(); return true; } return false; };
+  const start = () => {
+    if (tryClick()) return;
+    const obs = new MutationObserver(() => { if (tryClick()) obs.disconnect(); });
+    obs.observe(document.documentElement, { subtree: true, childList: true });
+    setTimeout(() => obs.disconnect(), %d);
+  };
+  if (document.readyState === 'loading') document.addEventListener('DOMContentLoaded', start, { once: true });
+  else start();
+})();
+""" % CONSENT_WATCH_MS
+
+# Login page probe: avatar present?
+LOGIN_PROBE_SCRIPT = "() => !!document.querySelector('#avatar-btn')"
+
 # Dropdown/caret that opens the menu on the pill
 SUBSCRIBED_DROPDOWN_SELECTORS = (
     "yt-button-shape[aria-haspopup='menu'] button:has(span:has-text('Subscribed'))",
     "yt-button-shape:has(button:has(span:has-text('Subscribed'))) + yt-button-shape button",
 )
 
+# Containers an open notifications menu can live in
+MENU_ROOT_SELECTORS = (
+    "yt-sheet-view-model, ytd-menu-popup-renderer, "
+    "tp-yt-paper-menu-button[opened], tp-yt-iron-dropdown:not([aria-hidden='true'])"
+)
+MENU_ROOT_ATTR = "data-yt-sub-menu-root"
+MENU_ROOT_SCRIPT = """
+([sels, attr]) => {
+  document.querySelectorAll(`[${attr}]`).forEach(el => el.removeAttribute(attr));
+  for (const el of document.querySelectorAll(sels)) {
+    const r = el.getBoundingClientRect();
+    if (r.width && r.height && getComputedStyle(el).visibility !== 'hidden') {
+      el.setAttribute(attr, '');
+      return true;
+    }
+  }
+  return false;
+}
+"""
+
+# Items of an open notifications menu (old role-based menu / new radio sheet)
+MENU_ITEM_SELECTORS = "[role='menuitemradio'], radio-shape label"
+
+# youtubei call that saves the channel's notification preference: picking None is only done
+# once it has answered (the radio sheet has no menuitemradio to watch disappear)
+NOTIF_PREF_URL_PART = "youtubei/v1/notification/modify_channel_preference"
+NOTIF_PREF_TIMEOUT_MS = 5000
+
+# aria-label of the bell next to the Subscribed pill (describes the current notification setting)
+BELL_LABEL_SCRIPT = (
+    "() => document.querySelector('yt-subscribe-button-shape + yt-button-shape button')"
+    "?.getAttribute('aria-label') || ''"
+)
+
 # Bell button (if separate)
 NOTIF_BELL_SELECTORS = (
     "button[aria-label*='notifications']",
@@ -89,11 +206,13 @@ def build_none_selectors(labels: List[str]) -> dict:
     Build selectors for the 'None' radio item:
       - role(name) regex + role(has_text) filter
       - CSS role scan
-      - text-based
-      - absolute XPath fallback (last resort)
+      - text-based (CSS entries fused into one union, XPath kept separate)
+      - absolute path fallback (last resort, as an equivalent CSS path)
     """
     joined = "|".join(re.escape(lbl.strip()) for lbl in labels if lbl.strip())
     role_regex: Pattern[str] = re.compile(rf"^(?:{joined})$", re.I)
+    # same labels as whole words, for the setting part of the bell button's aria-label
+    state_regex: Pattern[str] = re.compile(rf"\b(?:{joined})\b", re.I)
 
     text_css = []
     for lbl in labels:
@@ -109,13 +228,30 @@ def build_none_selectors(labels: List[str]) -> dict:
         ))
 
     return {
+        "labels": tuple(lbl.strip() for lbl in labels if lbl.strip()),
         "role_regex": role_regex,
+        "state_regex": state_regex,
         "role_css": "[role='menuitemradio']",
-        "text_css": tuple(text_css),
-        # from your screenshot (index can vary; keep as last resort)
-        "xpath_fallback": '//*[@id="contentWrapper"]/yt-sheet-view-model/yt-contextual-sheet-layout/div[2]/yt-list-view-model/yt-list-item-view-model[3]/radio-shape/label',
+        "text_css_union": ", ".join(sel for sel in text_css if not sel.startswith("//")),
+        "text_xpath": tuple(sel for sel in text_css if sel.startswith("//")),
+        # from your screenshot (index can vary; keep as last resort). Was the absolute XPath
+        # //*[@id="contentWrapper"]/yt-sheet-view-model/yt-contextual-sheet-layout/div[2]/
+        #   yt-list-view-model/yt-list-item-view-model[3]/radio-shape/label
+        "css_fallback": (
+            "#contentWrapper > yt-sheet-view-model > yt-contextual-sheet-layout > div:nth-of-type(2)"
+            " > yt-list-view-model > yt-list-item-view-model:nth-of-type(3) > radio-shape > label"
+        ),
     }
 
+# Index of the first of up to 20 `sel` items whose text equals one of `labels` (case-insensitive), or -1
+NONE_INDEX_SCRIPT = r"""
+(root, [sel, labels]) => {
+  const esc = s => s.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+  const re = new RegExp('^(?:' + labels.map(esc).join('|') + ')$', 'i');
+  return [...root.querySelectorAll(sel)].slice(0, 20).findIndex(e => re.test((e.innerText || '').trim()));
+}
+"""
+
 # set in main()
 NONE_SELECTORS = {}
 
@@ -132,88 +268,212 @@ logging.basicConfig(
 # Utilities
 # ---------------------------------------------------------------------
 
-def read_offset(path: Path = CFG.offset_file) -> int:
+# Characters that make csv.writer quote a field (default dialect: delimiter, quotechar, line breaks)
+CSV_SPECIAL_CHARS = ',"\r\n'
+
+def read_offset(path: Path = CFG.offset_file) -> Tuple[int, int]:
+    """Return (row index, CSV byte position of that row); files with a bare index give position 0."""
     if not path.exists():
-        return 0
+        return 0, 0
     try:
-        return int(path.read_text(encoding="utf-8").strip() or "0")
+        idx, _, pos = (path.read_text(encoding="utf-8").strip() or "0").partition("\t")
+        return int(idx), int(pos or "0")
     except Exception:
-        return 0
-
-def write_offset(i: int, path: Path = CFG.offset_file) -> None:
-    path.write_text(str(i), encoding="utf-8")
-
-def iter_csv_rows(path: Path) -> Iterable[Tuple[int, dict]]:
-    with path.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for idx, row in enumerate(reader):
-            yield idx, row
-
-def click_consent_if_present(page: Page) -> None:
-    selectors = (
-        "button:has-text('I agree')",
-        "button:has-text('Accept all')",
-        "#introAgreeButton",
-        "form[action*='consent'] button[type='submit']",
-    )
-    for sel in selectors:
+        return 0, 0
+
+def write_offset(fp, i: int, pos: int = 0) -> None:
+    """Overwrite the offset in an already-open binary handle (see OffsetTracker)."""
+    fp.seek(0)
+    fp.truncate()
+    fp.write(f"{i}\t{pos}".encode("ascii"))
+    fp.flush()
+
+def read_done_urls(done_path: Path, log_path: Path) -> Set[str]:
+    """URLs fully handled in earlier runs (one per line in done_path).
+
+    The first time, done_path is seeded from the human-readable log so older runs count too;
+    lines with a [reason] suffix (subscribed, but notifications not set) are left out so those
+    channels are retried.
+    """
+    if done_path.exists():
+        return {ln.strip() for ln in done_path.read_text(encoding="utf-8").splitlines() if ln.strip()}
+    urls = set()
+    if log_path.exists():
+        urls = {m.group(1) for m in re.finditer(r"^Subscribed: .*\((https?://\S+)\)$", log_path.read_text(encoding="utf-8"), re.M)}
+        done_path.write_text("".join(u + "\n" for u in sorted(urls)), encoding="utf-8")
+    return urls
+
+def count_csv_rows(path: Path) -> int:
+    """Cheap row count for progress logging: newline count minus the header, no CSV parsing."""
+    with path.open("rb") as f:
+        lines = sum(buf.count(b"\n") for buf in iter(lambda: f.read(1 << 20), b""))
+    return max(0, lines - 1)
+
+def iter_csv_rows(path: Path, start: Tuple[int, int] = (0, 0)) -> Iterable[Tuple[int, str, str, int]]:
+    """Yield (idx, channel_url, channel_title, end_pos); column positions are resolved once from the header.
+
+    end_pos is the byte position just past the row. With start=(idx, pos) from a previous end_pos the
+    file is seeked straight to that row instead of re-parsing everything before it.
+    """
+    with path.open("rb", buffering=1 << 20) as f:
+        # readline() (not iteration) keeps f.tell() exact at every record boundary
+        reader = csv.reader(line.decode("utf-8") for line in iter(f.readline, b""))
+        header = next(reader, [])
         try:
-            loc = page.locator(sel).first
+            url_i = header.index("Channel Url")
+        except ValueError:
+            raise SystemExit(f"CSV has no 'Channel Url' column: {path}")
+        title_i = header.index("Channel Title") if "Channel Title" in header else None
+
+        start_idx, start_pos = start
+        if start_pos > f.tell() and start_pos <= path.stat().st_size:
+            f.seek(start_pos)
+        else:
+            start_idx = 0
+        idx = start_idx
+        for row in reader:
+            if not row:  # blank line (e.g. trailing one in a Takeout export): no row, no index
+                continue
+            url = row[url_i] if url_i < len(row) else ""
+            title = row[title_i] if title_i is not None and title_i < len(row) else ""
+            yield idx, url, title, f.tell()
+            idx += 1
+
+def cached_locator(page: Page, selector: str, build: Optional[Callable[[Page], Locator]] = None) -> Locator:
+    """Return page.locator(selector).first (or build(page).first, cached under the key `selector`),
+    reusing the Locator object across rows."""
+    cache = getattr(page, "_locator_cache", None)
+    if cache is None:
+        cache = page._locator_cache = {}
+    loc = cache.get(selector)
+    if loc is None:
+        loc = cache[selector] = (build(page) if build else page.locator(selector)).first
+    return loc
+
+def subscribe_locator(page: Page) -> Locator:
+    return page.get_by_role("button", name=SUBSCRIBE_ROLE_NAME, exact=True).or_(page.locator(SUBSCRIBE_ARIA_CSS))
+
+def channel_ready_locator(page: Page) -> Locator:
+    """Either pill means the channel page is ready to act on."""
+    return subscribe_locator(page).or_(page.locator(SUBSCRIBED_ANY))
+
+def block_heavy_requests(page: Page) -> None:
+    """Block BLOCKED_URL_PATTERNS for this page inside the browser.
+
+    CDP rather than ctx.route(): any route handler turns the HTTP cache off, so every full load
+    would re-download YouTube's JS bundles and send each request through Python.
+    """
+    cdp = page.context.new_cdp_session(page)
+    cdp.send("Network.enable")
+    cdp.send("Network.setBlockedURLs", {"urls": list(BLOCKED_URL_PATTERNS)})
+
+def click_consent_if_present(page: Page) -> bool:
+    """One-off click for the first page of the login window; every context otherwise relies on
+    CONSENT_AUTOCLICK_SCRIPT."""
+    try:
+        cached_locator(page, CONSENT_ANY).wait_for(state="visible", timeout=200)
+        # the union's .first is in DOM order, so click by CONSENT_SELECTORS priority instead
+        for sel in CONSENT_SELECTORS:
+            loc = cached_locator(page, sel)
             if loc.is_visible():
                 loc.click()
                 page.wait_for_timeout(300)
-                return
-        except Exception:
-            continue
-
-def any_page_has_avatar(ctx) -> bool:
-    for p in ctx.pages:
-        try:
-            if p.locator("#avatar-btn").first.is_visible():
                 return True
-        except Exception:
-            continue
+    except Exception:
+        pass
     return False
 
+def goto_home(page: Page) -> None:
+    """Load the YouTube home page, waiting at most HOME_DCL_TIMEOUT_MS for DOMContentLoaded.
+
+    Nothing after this gates on a specific element, so DCL is kept here (channel pages navigate on
+    'commit' instead); a slow load is not fatal, the avatar check that follows still runs.
+    """
+    try:
+        page.goto(YOUTUBE_HOME, wait_until="domcontentloaded", timeout=HOME_DCL_TIMEOUT_MS)
+    except PlaywrightTimeoutError:
+        logging.debug("YouTube home not loaded within %d ms; continuing", HOME_DCL_TIMEOUT_MS)
+
+def probe_login_state(page: Page) -> bool:
+    """Avatar present on one page, in a single evaluate; False while the page navigates."""
+    try:
+        return bool(page.evaluate(LOGIN_PROBE_SCRIPT))
+    except Exception:
+        return False
+
+def any_page_has_avatar(ctx, page: Optional[Page] = None) -> bool:
+    """Probe `page` only; scan every page of ctx only if it is missing or was closed."""
+    if page is not None and not page.is_closed():
+        return probe_login_state(page)
+    return any(probe_login_state(p) for p in ctx.pages)
+
 def wait_until_logged_in(ctx, timeout_secs: int) -> bool:
-    user_done = {"flag": False}
+    user_done = threading.Event()
     def wait_for_enter():
         input("Press Enter here once you've finished logging in...\n")
-        user_done["flag"] = True
+        user_done.set()
     threading.Thread(target=wait_for_enter, daemon=True).start()
 
     page = ctx.pages[0] if ctx.pages else ctx.new_page()
     if "youtube.com" not in (page.url or ""):
-        page.goto(YOUTUBE_HOME, wait_until="domcontentloaded")
-        click_consent_if_present(page)
-
-    start = time.time()
-    while (time.time() - start) < timeout_secs:
-        for p in ctx.pages:
-            click_consent_if_present(p)
-        if user_done["flag"] or any_page_has_avatar(ctx):
+        goto_home(page)
+
+    # Watch only the primary page; wait_for_selector returns the moment the avatar renders.
+    # The wait is sliced so an Enter press is still noticed within LOGIN_ENTER_POLL_MS.
+    deadline = time.monotonic() + timeout_secs
+    while time.monotonic() < deadline and not user_done.is_set():
+        try:
+            page.wait_for_selector("#avatar-btn", state="visible", timeout=LOGIN_ENTER_POLL_MS)
             return True
-        time.sleep(1.0)
-    return False
+        except PlaywrightTimeoutError:
+            continue
+        except Exception:
+            if not page.is_closed():
+                raise
+            if not ctx.pages:  # login window closed
+                return False
+            page = ctx.pages[0]
+    return user_done.is_set()
 
 # ---------------------------------------------------------------------
 # Auth
 # ---------------------------------------------------------------------
 
-def ensure_auth_and_get_state_file(p, headless_for_check: bool) -> Path:
+def ensure_auth_and_get_state_file(p, headless_for_check: bool) -> Tuple[Path, Optional[Browser]]:
+    """Return (state_file, browser).
+
+    When an existing auth.json checks out and the check browser was launched with the worker's
+    options, that browser is returned still open so the worker can reuse it; otherwise None.
+    """
     if CFG.auth_file.exists():
         logging.info("Checking existing auth.json...")
-        browser = p.chromium.launch(headless=headless_for_check, args=list(CFG.chromium_args))
+        reuse = headless_for_check == CFG.headless_work and not CFG.devtools
+        if reuse:
+            browser = launch_worker_browser(p)
+        else:
+            browser = p.chromium.launch(headless=headless_for_check, args=CHROMIUM_ARGS)
         ctx = browser.new_context(storage_state=str(CFG.auth_file))
+        ctx.add_init_script(CONSENT_AUTOCLICK_SCRIPT)
+        ctx.set_default_navigation_timeout(CFG.nav_timeout_ms)
         page = ctx.new_page()
-        page.add_init_script(INIT_SCRIPT)
-        page.goto(YOUTUBE_HOME, wait_until="domcontentloaded")
-        click_consent_if_present(page)
-        ok = any_page_has_avatar(ctx)
-        ctx.close(); browser.close()
+        block_heavy_requests(page)
+        goto_home(page)
+        ok = any_page_has_avatar(ctx, page)
+        if not ok:
+            # the home page may still be rendering; don't discard a good auth.json over a slow load
+            try:
+                page.wait_for_selector("#avatar-btn", state="attached", timeout=WAIT_MS)
+                ok = True
+            except PlaywrightTimeoutError:
+                pass
+        ctx.close()
         if ok:
             logging.info("Existing auth.json is valid.")
-            return CFG.auth_file
+            if reuse:
+                return CFG.auth_file, browser
+            browser.close()
+            return CFG.auth_file, None
+        browser.close()
         logging.info("Existing auth.json invalid; removing.")
         try: CFG.auth_file.unlink(missing_ok=True)
         except Exception: pass
@@ -221,22 +481,23 @@ def ensure_auth_and_get_state_file(p, headless_for_check: bool) -> Path:
     logging.info("No valid auth. Opening a visible window for login...")
     browser = p.chromium.launch(
         headless=False,  # login headful
-        args=list(CFG.chromium_args),
+        args=CHROMIUM_ARGS,
         devtools=CFG.devtools,
         slow_mo=CFG.slowmo_ms or None,
     )
     ctx = browser.new_context()
+    ctx.add_init_script(INIT_SCRIPT)  # once per context: also covers tabs opened during login
+    ctx.add_init_script(CONSENT_AUTOCLICK_SCRIPT)
     page = ctx.new_page()
-    page.add_init_script(INIT_SCRIPT)
-    page.goto(YOUTUBE_HOME, wait_until="domcontentloaded")
-    click_consent_if_present(page)
+    goto_home(page)
+    click_consent_if_present(page)  # the only Python-side consent click, at startup
 
     logging.info("Complete login in the opened window. You can press Enter here when done.")
     if not wait_until_logged_in(ctx, CFG.login_wait_secs):
         ctx.close(); browser.close()
         raise SystemExit("Login not detected in time.")
 
-    if not any_page_has_avatar(ctx):
+    if not any_page_has_avatar(ctx, page):
         ctx.close(); browser.close()
         raise SystemExit("Avatar not detected; not saving state.")
 
@@ -244,7 +505,7 @@ def ensure_auth_and_get_state_file(p, headless_for_check: bool) -> Path:
     ctx.storage_state(path=str(CFG.auth_file))
     logging.info("Saved login to %s", CFG.auth_file)
     ctx.close(); browser.close()
-    return CFG.auth_file
+    return CFG.auth_file, None
 
 # ---------------------------------------------------------------------
 # Subscribe / Notifications
@@ -257,31 +518,24 @@ class SubscribeResult:
         self.reason = reason
 
 def _scroll_into_view(locator: Locator, timeout_ms: int = None):
+    # no settle sleep: the following click() waits for the element to be stable itself
     try:
-        locator.scroll_into_view_if_needed(timeout=timeout_ms or int(CFG.wait_secs * 1000))
-        locator.page.wait_for_timeout(80)
+        locator.scroll_into_view_if_needed(timeout=timeout_ms or WAIT_MS)
     except Exception:
         pass
 
 def get_menu_root(page: Page) -> Locator:
     """Return the active menu / contextual sheet container."""
-    candidates = page.locator(
-        "yt-sheet-view-model, ytd-menu-popup-renderer, "
-        "tp-yt-paper-menu-button[opened], tp-yt-iron-dropdown:not([aria-hidden='true'])"
-    )
-    # pick the first visible one
-    for i in range(min(5, candidates.count() or 1)):
-        try:
-            root = candidates.nth(i)
-            if root.is_visible():
-                return root
-        except Exception:
-            continue
+    # pick the first visible one in a single round-trip; it is tagged so a Locator can pin it
+    try:
+        if page.evaluate(MENU_ROOT_SCRIPT, [MENU_ROOT_SELECTORS, MENU_ROOT_ATTR]):
+            return cached_locator(page, f"[{MENU_ROOT_ATTR}]")
+    except Exception as e:
+        logging.debug("menu root probe failed: %s", e)
     # fallback to page (unscoped)
     return page.locator(":root")
 
-def menu_is_open(page: Page) -> bool:
-    root = get_menu_root(page)
+def menu_is_open(root: Locator) -> bool:
     try:
         if root.locator("[role='menuitemradio']").first.is_visible():
             return True
@@ -291,149 +545,182 @@ def menu_is_open(page: Page) -> bool:
         pass
     return False
 
-def open_notifications_menu(page: Page) -> bool:
-    """Open bell OR subscribed dropdown to reveal All/Personalized/None."""
-    if menu_is_open(page):
-        return True
+def _wait_menu_mounted(page: Page) -> None:
+    """Return as soon as menu items render (instead of a fixed mount delay)."""
+    try:
+        page.wait_for_selector(MENU_ITEM_SELECTORS, state="visible", timeout=1500)
+    except Exception:
+        pass
+
+def open_notifications_menu(page: Page) -> Optional[Locator]:
+    """Open bell OR subscribed dropdown to reveal All/Personalized/None; return the open menu root."""
+    root = get_menu_root(page)
+    if menu_is_open(root):
+        return root
 
     # Try the bell
     for sel in NOTIF_BELL_SELECTORS:
         try:
-            bell = page.locator(sel).first
-            bell.wait_for(state="visible", timeout=int(CFG.wait_secs * 1000))
+            bell = cached_locator(page, sel)
+            bell.wait_for(state="visible", timeout=WAIT_MS)
             _scroll_into_view(bell)
             bell.click()
-            page.wait_for_timeout(500)  # time to mount
-            if menu_is_open(page):
-                return True
+            _wait_menu_mounted(page)
+            root = get_menu_root(page)
+            if menu_is_open(root):
+                return root
         except Exception:
             continue
 
     # Try the Subscribed pill / dropdown
     for sel in SUBSCRIBED_DROPDOWN_SELECTORS + SUBSCRIBED_SELECTORS:
         try:
-            sub_btn = page.locator(sel).first
-            sub_btn.wait_for(state="visible", timeout=int(CFG.wait_secs * 1000))
+            sub_btn = cached_locator(page, sel)
+            sub_btn.wait_for(state="visible", timeout=WAIT_MS)
             _scroll_into_view(sub_btn)
             sub_btn.click()
-            page.wait_for_timeout(600)
-            if menu_is_open(page):
-                return True
+            _wait_menu_mounted(page)
+            root = get_menu_root(page)
+            if menu_is_open(root):
+                return root
         except Exception:
             continue
 
-    return False
+    return None
 
-def _click_none_by_role(page: Page) -> bool:
+def _none_by_role(root: Locator) -> Optional[Locator]:
     """Fast attempts using ARIA role; keep short timeouts so we fall back quickly."""
-    try:
+    attempts = (
         # 1) Filter by text on role (works even if accessible name is odd)
-        elem = page.get_by_role("menuitemradio").filter(has_text=NONE_SELECTORS["role_regex"]).first
-        elem.wait_for(state="visible", timeout=CFG.role_first_try_ms)
-        _scroll_into_view(elem)
-        elem.click()
-        page.wait_for_timeout(200)
-        return True
-    except Exception as e:
-        logging.debug("role(has_text=regex) failed: %s", e)
-
-    try:
+        ("role(has_text=regex)", root.get_by_role("menuitemradio").filter(has_text=NONE_SELECTORS["role_regex"])),
         # 2) Classic role name regex (short timeout)
-        elem = page.get_by_role("menuitemradio", name=NONE_SELECTORS["role_regex"]).first
-        elem.wait_for(state="visible", timeout=CFG.role_first_try_ms)
-        _scroll_into_view(elem)
-        elem.click()
-        page.wait_for_timeout(200)
-        return True
-    except Exception as e:
-        logging.debug("role(name=regex) failed: %s", e)
-
-    return False
+        ("role(name=regex)", root.get_by_role("menuitemradio", name=NONE_SELECTORS["role_regex"])),
+    )
+    for what, loc in attempts:
+        try:
+            loc.first.wait_for(state="visible", timeout=ROLE_MS)
+            return loc.first
+        except Exception as e:
+            logging.debug("%s failed: %s", what, e)
+    return None
 
-def _click_none_by_css_scan(page: Page) -> bool:
+def _none_by_css_scan(root: Locator) -> Optional[Locator]:
     try:
         role_css = NONE_SELECTORS["role_css"]
-        re_pat: Pattern[str] = NONE_SELECTORS["role_regex"]
-        root = get_menu_root(page)
-        candidates = root.locator(role_css)
-        count = candidates.count()
-        for i in range(min(20, max(1, count))):
-            item = candidates.nth(i)
-            try:
-                text = item.inner_text(timeout=500).strip()
-            except Exception:
-                continue
-            if re_pat.search(text or ""):
-                _scroll_into_view(item)
-                try:
-                    item.click()
-                except Exception:
-                    item.click(force=True)
-                page.wait_for_timeout(200)
-                return True
+        # match the item texts in-browser: one round-trip instead of one inner_text() per item
+        idx = root.evaluate(NONE_INDEX_SCRIPT, [role_css, list(NONE_SELECTORS["labels"])])
+        if idx >= 0:
+            return root.locator(role_css).nth(idx)
     except Exception as e:
         logging.debug("css role scan failed: %s", e)
-    return False
-
-def set_notifications_none(page: Page) -> SubscribeResult:
-    if not open_notifications_menu(page):
-        return SubscribeResult(False, "notif menu not found")
-
-    # Scoped to the open menu to avoid stray matches
-    root = get_menu_root(page)
+    return None
 
-    # 1) Prefer quick ARIA-role attempts
-    if _click_none_by_role(root.page):
-        return SubscribeResult(True)
-
-    # 2) CSS role scan inside root (this is likely what worked for you)
-    if _click_none_by_css_scan(root.page):
-        return SubscribeResult(True)
-
-    # 3) Text-based selectors inside root
-    for sel in NONE_SELECTORS["text_css"]:
+def _none_by_text(page: Page, root: Locator) -> Optional[Locator]:
+    # Text-based selectors inside root: one union wait, then XPath entries without waiting
+    try:
+        item = root.locator(NONE_SELECTORS["text_css_union"]).first
+        item.wait_for(state="visible", timeout=1200)
+        return item
+    except Exception:
+        pass
+    for sel in NONE_SELECTORS["text_xpath"]:
         try:
             item = root.locator(sel).first
-            item.wait_for(state="visible", timeout=1200)
-            _scroll_into_view(item)
-            item.click()
-            page.wait_for_timeout(200)
-            return SubscribeResult(True)
+            if item.is_visible():
+                return item
         except Exception:
             continue
 
-    # 4) Absolute XPath fallback
+    # Absolute path fallback (anchored at #contentWrapper, so page-scoped and cached per page)
     try:
-        x = root.locator(NONE_SELECTORS["xpath_fallback"])
+        x = cached_locator(page, NONE_SELECTORS["css_fallback"])
         if x.is_visible():
-            _scroll_into_view(x)
-            x.click()
-            page.wait_for_timeout(200)
-            return SubscribeResult(True)
+            return x
     except Exception:
         pass
+    return None
+
+def _is_notif_pref_response(response) -> bool:
+    return NOTIF_PREF_URL_PART in response.url
+
+def notifications_already_none(page: Page, channel_title: str = "") -> bool:
+    """One evaluate on the bell's aria-label; True if its setting part reports a 'None' label.
+
+    The label also names the channel ("Current setting is ... for <channel>"), so only its first
+    sentence is searched, with the channel title cut out: a channel called "None ..." is not muted.
+    """
+    try:
+        label = page.evaluate(BELL_LABEL_SCRIPT) or ""
+    except Exception:
+        return False
+    if channel_title:
+        label = label.replace(channel_title, " ")
+    setting = label.split(". ", 1)[0]
+    return bool(NONE_SELECTORS["state_regex"].search(setting))
+
+def set_notifications_none(page: Page) -> SubscribeResult:
+    # Scoped to the open menu to avoid stray matches (resolved once, reused below)
+    root = open_notifications_menu(page)
+    if root is None:
+        return SubscribeResult(False, "notif menu not found")
+
+    # Quick ARIA-role attempts first, then the CSS role scan, then text / absolute-path fallbacks
+    item = _none_by_role(root) or _none_by_css_scan(root) or _none_by_text(page, root)
+    if item is None:
+        return SubscribeResult(False, "notif 'None' option not found")
 
-    return SubscribeResult(False, "notif 'None' option not found")
+    # Done when the preference change has been saved, not when the menu hides
+    _scroll_into_view(item)
+    try:
+        with page.expect_response(_is_notif_pref_response, timeout=NOTIF_PREF_TIMEOUT_MS):
+            try:
+                item.click()
+            except Exception:
+                item.click(force=True)
+    except PlaywrightTimeoutError:
+        return SubscribeResult(False, "notif 'None' change not confirmed")
+    return SubscribeResult(True)
+
+def navigate_to_channel(page: Page, channel_url: str) -> None:
+    """SPA navigation when the page is already on the channel's host; full load for the first row,
+    and for every row once an SPA attempt on this page has failed (don't pay the timeout again).
+
+    Only the path + query is pushed: Takeout URLs are http:// while the page is https://, and a
+    cross-origin pushState throws.
+    """
+    target = urlsplit(channel_url)
+    if target.netloc == urlsplit(page.url or "").netloc and not getattr(page, "_spa_failed", False):
+        path = target.path + (f"?{target.query}" if target.query else "")
+        try:
+            if page.evaluate(SPA_NAVIGATE_SCRIPT, [path or "/", SPA_NAV_TIMEOUT_MS]):
+                return
+            logging.info("SPA navigation not finished within %d ms; using full page loads from now on",
+                         SPA_NAV_TIMEOUT_MS)
+        except Exception as e:
+            logging.info("SPA navigation failed, using full page loads from now on: %s", e)
+        page._spa_failed = True
+    page.goto(channel_url, wait_until="commit")
 
 def subscribe_once(page: Page, channel_title: str, channel_url: str) -> SubscribeResult:
     """Go to channel, subscribe if needed, then ALWAYS set notifications to None."""
     try:
-        page.goto(channel_url, wait_until="domcontentloaded")
-        click_consent_if_present(page)
+        navigate_to_channel(page, channel_url)
     except Exception as e:
         return SubscribeResult(False, f"navigation: {e}")
 
     try:
-        # Try to subscribe (if not already)
+        # Navigation returns on commit; a single wait races Subscribe / Subscribed to gate
+        # readiness (a consent dialog is clicked away by the context's init script).
+        try:
+            cached_locator(page, "channel-ready", channel_ready_locator).wait_for(state="visible", timeout=WAIT_MS)
+        except PlaywrightTimeoutError:
+            return SubscribeResult(False, "subscribe button not found")
+
+        # Try to subscribe (if not already). Once the race resolved, one probe for Subscribed
+        # tells the two pills apart.
         subscribe_btn = None
-        for sel in SUBSCRIBE_SELECTORS:
-            loc = page.locator(sel).first
-            try:
-                loc.wait_for(state="visible", timeout=int(CFG.wait_secs * 1000))
-                subscribe_btn = loc
-                break
-            except Exception:
-                continue
+        if not cached_locator(page, SUBSCRIBED_ANY).is_visible():
+            subscribe_btn = cached_locator(page, "subscribe", subscribe_locator)
 
         if subscribe_btn:
             _scroll_into_view(subscribe_btn)
@@ -441,20 +728,13 @@ def subscribe_once(page: Page, channel_title: str, channel_url: str) -> Subscrib
                 subscribe_btn.click()
             except Exception:
                 subscribe_btn.click(force=True)
-            page.wait_for_timeout(500)
-        else:
-            # Ensure "Subscribed" is present
-            ok = False
-            for sel in SUBSCRIBED_SELECTORS:
-                loc = page.locator(sel).first
-                try:
-                    loc.wait_for(state="visible", timeout=int(CFG.wait_secs * 1000))
-                    ok = True
-                    break
-                except Exception:
-                    continue
-            if not ok:
-                return SubscribeResult(False, "subscribe button not found")
+            try:
+                cached_locator(page, SUBSCRIBED_ANY).wait_for(state="visible", timeout=1500)
+            except PlaywrightTimeoutError:
+                pass
+        elif notifications_already_none(page, channel_title):
+            # already subscribed with notifications off: nothing to change
+            return SubscribeResult(True)
 
         # Always set notifications to None
         notif = set_notifications_none(page)
@@ -469,78 +749,228 @@ def subscribe_once(page: Page, channel_title: str, channel_url: str) -> Subscrib
 # Worker
 # ---------------------------------------------------------------------
 
-def run_worker_with_state(p, storage_state_path: Path) -> None:
-    with CFG.log_file.open("a", encoding="utf-8") as log_fp, \
-         CFG.skipped_file.open("a", newline="", encoding="utf-8") as skipped_fp:
+def new_worker_page(ctx) -> Page:
+    # no INIT_SCRIPT here: media requests are blocked by block_heavy_requests, so nothing can play
+    page = ctx.new_page()
+    block_heavy_requests(page)
+    page._locator_cache = {}  # selector -> Locator, see cached_locator(); dies with the page
+    return page
 
-        skipped_writer = csv.writer(skipped_fp)
-        with CFG.csv_file.open(newline="", encoding="utf-8") as f:
-            total = sum(1 for _ in csv.DictReader(f))
-
-        processed_since_restart = 0
-        start_index = read_offset()
-
-        browser = p.chromium.launch(
-            headless=CFG.headless_work,
-            args=list(CFG.chromium_args),
-            devtools=CFG.devtools,
-            slow_mo=CFG.slowmo_ms or None,
-        )
-        ctx = browser.new_context(storage_state=str(storage_state_path))
-        page = ctx.new_page()
-        page.add_init_script(INIT_SCRIPT)
+class OffsetTracker:
+    """Rows finish out of order across workers; persist only the lowest index not yet done.
 
-        try:
-            for idx, row in iter_csv_rows(CFG.csv_file):
-                if idx < start_index:
-                    continue
+    The offset file stays open for the whole run and writes are batched every
+    CFG.offset_flush_every rows; call close() on exit. The buffered `logs` handles are flushed
+    before each offset write, so the saved offset never gets ahead of what they record.
+    """
+    __slots__ = ("next_idx", "next_pos", "_done", "_flushed_idx", "_fp", "_logs")
+    def __init__(self, start: Tuple[int, int], path: Path = CFG.offset_file, logs: tuple = ()):
+        self.next_idx, self.next_pos = start
+        self._done = {}  # idx -> byte position just past that row
+        self._flushed_idx = self.next_idx
+        self._fp = path.open("r+b" if path.exists() else "w+b")
+        self._logs = logs
+
+    def mark_done(self, idx: int, end_pos: int) -> None:
+        self._done[idx] = end_pos
+        while self.next_idx in self._done:
+            self.next_pos = self._done.pop(self.next_idx)
+            self.next_idx += 1
+        if self.next_idx - self._flushed_idx >= CFG.offset_flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.next_idx != self._flushed_idx:
+            for fp in self._logs:
+                fp.flush()
+            write_offset(self._fp, self.next_idx, self.next_pos)
+            self._flushed_idx = self.next_idx
+
+    def close(self) -> None:
+        self.flush()
+        self._fp.close()
+
+def launch_worker_browser(p):
+    return p.chromium.launch(
+        headless=CFG.headless_work,
+        args=CHROMIUM_ARGS,
+        devtools=CFG.devtools,
+        slow_mo=CFG.slowmo_ms or None,
+    )
+
+def open_worker_context(browser, storage_state_path: Path):
+    ctx = browser.new_context(storage_state=str(storage_state_path))
+    ctx.add_init_script(CONSENT_AUTOCLICK_SCRIPT)
+    ctx.set_default_navigation_timeout(CFG.nav_timeout_ms)
+    return ctx, new_worker_page(ctx)
 
-                channel_url = (row.get("Channel Url") or "").strip()
-                channel_title = (row.get("Channel Title") or "").strip() or channel_url
-                logging.info("[%d/%d] %s (%s)", idx + 1, total, channel_title, channel_url or "no url")
+def run_worker_with_state(p, storage_state_path: Path, browser: Optional[Browser] = None) -> None:
+    """Process the CSV with CFG.workers browser contexts pulling rows from one queue.
 
-                if not channel_url:
-                    logging.warning("Missing URL; skipping row.")
-                    skipped_writer.writerow([channel_title, channel_url, "missing url"])
-                    write_offset(idx + 1)
+    Playwright's sync API is bound to the thread that started it, so worker 0 runs on the
+    caller's `p` (reusing `browser` if one is passed; it is closed at the end) and every
+    extra worker starts its own sync_playwright() in its own thread.
+    """
+    done_urls = read_done_urls(CFG.done_file, CFG.log_file)
+    if done_urls:
+        logging.info("%d channels already subscribed in earlier runs; they will be skipped.", len(done_urls))
+
+    with CFG.log_file.open("ab", buffering=64 * 1024) as log_fp, \
+         CFG.done_file.open("a", encoding="utf-8", buffering=64 * 1024) as done_fp, \
+         CFG.skipped_file.open("a", newline="", encoding="utf-8", buffering=64 * 1024) as skipped_fp:
+
+        skipped_writer = csv.writer(skipped_fp)
+        total = count_csv_rows(CFG.csv_file)
+        start = read_offset()
+        start_index = start[0]
+        n_workers = max(1, CFG.workers)
+
+        rows: "queue.Queue[Optional[Tuple[int, str, str, int]]]" = queue.Queue(maxsize=n_workers * 2)
+        stop = threading.Event()
+        lock = threading.Lock()  # guards log_fp, done_fp, done_urls, skipped_writer and offsets
+        offsets = OffsetTracker(start, logs=(log_fp, done_fp, skipped_fp))
+
+        def put_row(item) -> None:
+            while not stop.is_set():
+                try:
+                    rows.put(item, timeout=0.5)
+                    return
+                except queue.Full:
                     continue
 
-                result = subscribe_once(page, channel_title, channel_url)
+        def feed_rows() -> None:
+            try:
+                for item in iter_csv_rows(CFG.csv_file, start):
+                    if stop.is_set():
+                        return
+                    if item[0] >= start_index:  # only filters when resuming from a bare-index offset
+                        put_row(item)
+            finally:
+                for _ in range(n_workers):
+                    put_row(None)
+
+        def next_row() -> Optional[Tuple[int, str, str, int]]:
+            while not stop.is_set():
+                try:
+                    return rows.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+            return None
+
+        def record(idx: int, end_pos: int, channel_title: str, channel_url: str, result: SubscribeResult) -> None:
+            with lock:
                 if result.ok:
-                    msg = f"Subscribed to {channel_title}"
-                    if result.reason:
-                        msg += f" — {result.reason}"
-                    logging.info(msg)
-                    log_fp.write(f"Subscribed: {channel_title} ({channel_url}){(' [' + result.reason + ']') if result.reason else ''}\n")
+                    log_fp.write(f"Subscribed: {channel_title} ({channel_url}){(' [' + result.reason + ']') if result.reason else ''}\n".encode("utf-8"))
+                    if not result.reason:  # partial success: leave it for a later run to finish
+                        done_fp.write(channel_url + "\n")
+                        done_urls.add(channel_url)
                 else:
-                    logging.warning("Failed: %s — %s", result.reason, channel_title)
-                    skipped_writer.writerow([channel_title, channel_url, result.reason or "unknown"])
-
-                write_offset(idx + 1)
-                time.sleep(CFG.throttle_secs)
-
-                processed_since_restart += 1
-                if processed_since_restart >= CFG.restart_every_n:
-                    logging.info("Restarting browser to clear state/memory...")
+                    fields = (channel_title, channel_url, result.reason or "unknown")
+                    if any(c in f for f in fields for c in CSV_SPECIAL_CHARS):
+                        skipped_writer.writerow(fields)
+                    else:
+                        # common case needs no quoting: same bytes csv.writer would produce
+                        skipped_fp.write(",".join(fields) + "\r\n")
+                offsets.mark_done(idx, end_pos)
+
+        def work(wp, worker_no: int, browser: Optional[Browser] = None) -> None:
+            browser = browser or launch_worker_browser(wp)
+            ctx = None
+            processed_since_restart = 0
+            last_visit = time.monotonic() - THROTTLE
+            try:
+                ctx, page = open_worker_context(browser, storage_state_path)
+                while True:
+                    item = next_row()
+                    if item is None:
+                        break
+                    idx, channel_url, channel_title, end_pos = item
+
+                    channel_url = channel_url.strip()
+                    channel_title = channel_title.strip() or channel_url
+                    logging.info("[%d/%d] w%d %s (%s)", idx + 1, total, worker_no, channel_title, channel_url or "no url")
+
+                    if not channel_url:
+                        logging.warning("Missing URL; skipping row.")
+                        record(idx, end_pos, channel_title, channel_url, SubscribeResult(False, "missing url"))
+                        continue
+
+                    if channel_url in done_urls:
+                        logging.info("Already subscribed in an earlier run; skipping.")
+                        with lock:
+                            offsets.mark_done(idx, end_pos)
+                        continue
+
+                    # Throttle per worker, counted from the end of the previous channel: time spent
+                    # on bookkeeping, skipped rows or a context recycle is already part of the gap
+                    delay = THROTTLE - (time.monotonic() - last_visit)
+                    if delay > 0:
+                        time.sleep(delay)
+
+                    result = subscribe_once(page, channel_title, channel_url)
+                    last_visit = time.monotonic()
+                    if result.ok:
+                        msg = f"Subscribed to {channel_title}"
+                        if result.reason:
+                            msg += f" — {result.reason}"
+                        logging.info(msg)
+                    else:
+                        logging.warning("Failed: %s — %s", result.reason, channel_title)
+                    record(idx, end_pos, channel_title, channel_url, result)
+
+                    processed_since_restart += 1
+                    crashed = not browser.is_connected()
+                    if processed_since_restart >= CFG.restart_every_n or crashed:
+                        # Recycle the context (cheap) to release page memory; the browser
+                        # process stays up and is only torn down in finally, unless it crashed
+                        logging.info("Worker %d: recycling browser context to clear state/memory...", worker_no)
+                        with lock:
+                            offsets.flush()
+                        try:
+                            ctx.close()
+                        except Exception:
+                            pass
+                        ctx = None
+                        if crashed:
+                            logging.warning("Worker %d: browser disconnected; relaunching it.", worker_no)
+                            browser = launch_worker_browser(wp)
+                        ctx, page = open_worker_context(browser, storage_state_path)
+                        processed_since_restart = 0
+            finally:
+                if ctx is not None:
                     try:
-                        ctx.close(); browser.close()
+                        ctx.close()
                     except Exception:
                         pass
-                    browser = p.chromium.launch(
-                        headless=CFG.headless_work,
-                        args=list(CFG.chromium_args),
-                        devtools=CFG.devtools,
-                        slow_mo=CFG.slowmo_ms or None,
-                    )
-                    ctx = browser.new_context(storage_state=str(storage_state_path))
-                    page = ctx.new_page()
-                    page.add_init_script(INIT_SCRIPT)
-                    processed_since_restart = 0
-        finally:
+                try:
+                    browser.close()
+                except Exception:
+                    pass
+
+        def work_in_thread(worker_no: int) -> None:
             try:
-                ctx.close(); browser.close()
-            except Exception:
-                pass
+                with sync_playwright() as tp:
+                    work(tp, worker_no)
+            except BaseException:
+                # same as a failure in worker 0: report it now and stop the run, not at the end
+                logging.exception("Worker %d failed; stopping.", worker_no)
+                stop.set()
+                raise
+
+        try:
+            with ThreadPoolExecutor(max_workers=n_workers) as pool:
+                futures = [pool.submit(feed_rows)]
+                futures += [pool.submit(work_in_thread, n) for n in range(1, n_workers)]
+                try:
+                    work(p, 0, browser)
+                except BaseException:
+                    stop.set()  # let the other workers finish their current row and exit
+                    raise
+                for f in futures:
+                    f.result()
+        finally:
+            with lock:
+                offsets.close()
 
     logging.info("Done. All channels processed.")
 
@@ -553,6 +983,8 @@ def parse_args():
     ap.add_argument("--headful", action="store_true", help="Run headful (visible) worker browser.")
     ap.add_argument("--slowmo", dest="slowmo_ms", type=int, default=0, help="Slow each action by N ms (e.g. 250).")
     ap.add_argument("--devtools", action="store_true", help="Open DevTools on the worker browser.")
+    ap.add_argument("--workers", type=int, default=CFG.workers,
+                    help="Number of browser contexts processing channels in parallel.")
     ap.add_argument("--none-labels", type=str, default="None,Κανένα",
                     help="Comma-separated labels for the 'None' option (localize if needed).")
     ap.add_argument("--debug", action="store_true", help="Enable DEBUG logging.")
@@ -563,7 +995,7 @@ def parse_args():
 # ---------------------------------------------------------------------
 
 def main() -> None:
-    global CFG, NONE_SELECTORS
+    global NONE_SELECTORS
 
     args = parse_args()
     if args.debug:
@@ -574,17 +1006,18 @@ def main() -> None:
         labels = ["None"]
     NONE_SELECTORS = build_none_selectors(labels)
 
-    CFG = replace(CFG,
-                  headless_work=not args.headful,
-                  slowmo_ms=args.slowmo_ms,
-                  devtools=args.devtools)
+    apply_config(replace(CFG,
+                         headless_work=not args.headful,
+                         slowmo_ms=args.slowmo_ms,
+                         devtools=args.devtools,
+                         workers=args.workers))
 
     if not CFG.csv_file.exists():
         raise SystemExit(f"CSV file not found: {CFG.csv_file}")
 
     with sync_playwright() as p:
-        state_file = ensure_auth_and_get_state_file(p, headless_for_check=True)
-        run_worker_with_state(p, state_file)
+        state_file, browser = ensure_auth_and_get_state_file(p, headless_for_check=True)
+        run_worker_with_state(p, state_file, browser)
 
 if __name__ == "__main__":
     main()